@@ -1,12 +1,102 @@
 import json
 import csv
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from io import StringIO
 import os
 
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(
+            obj,
+            default=str,
+            # Даты сериализуются через default=str, как и в ветке со стандартным json
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode('utf-8')
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+try:
+    import ijson
+    _STREAM_ERRORS = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    _STREAM_ERRORS = ()
+
+# Файлы больше этого размера читаются потоково через ijson
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+# Размер буфера записи при экспорте в CSV
+CSV_BUFFER_SIZE = 1 << 20
+
+# Разрешение сохраняемых графиков
+CHART_DPI = 80
+
+# Целочисленные коды известных статусов задач
+STATUS_CODES = {
+    "активная": 0,
+    "в процессе": 1,
+    "завершенная": 2,
+    "неизвестно": 3
+}
+
+
+# Дата создания для задач без корректного поля created_at
+DEFAULT_CREATED_AT = datetime(2000, 1, 1)
+
+
+def _parse_created_at(value):
+    """
+    Разбор даты создания задачи
+    
+    Args:
+        value: Значение поля created_at (строка ISO 8601)
+    
+    Returns:
+        Наивная дата в локальном времени (DEFAULT_CREATED_AT, если значение некорректно)
+    """
+    try:
+        task_date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return DEFAULT_CREATED_AT
+    if task_date.tzinfo is not None:
+        task_date = task_date.astimezone().replace(tzinfo=None)
+    return task_date
+
+
+def _bucket_by_day(days, codes, start, ndays, nstatus):
+    """
+    Подсчет задач по дням и статусам
+    
+    Args:
+        days: Номера дней создания задач (дни от начала эпохи)
+        codes: Коды статусов задач
+        start: Номер первого дня периода
+        ndays: Количество дней в периоде
+        nstatus: Количество статусов
+    
+    Returns:
+        Матрица ndays x nstatus с количеством задач
+    """
+    offsets = days - start
+    in_range = (offsets >= 0) & (offsets < ndays)
+    flat = offsets[in_range] * nstatus + codes[in_range]
+    return np.bincount(flat, minlength=ndays * nstatus).reshape(ndays, nstatus)
+
+
 class TaskReporting:
     """Модуль отчетности для системы управления задачами"""
     
@@ -19,20 +109,75 @@ class TaskReporting:
         """
         self.tasks_file = tasks_file
         self.tasks = self._load_tasks()
+        self._fig = None
+        self._ax = None
     
     def _load_tasks(self):
         """Загрузка задач из JSON-файла"""
-        if not os.path.exists(self.tasks_file):
+        self._file_stat = self._stat_tasks_file()
+        tasks = []
+        created = []
+        codes = []
+        # Неизвестные статусы получают коды после известных
+        status_codes = dict(STATUS_CODES)
+        
+        if self._file_stat is None:
             print(f"Файл {self.tasks_file} не найден. Возвращаем пустой список.")
-            return []
-        
+        else:
+            try:
+                # Даты создания разбираются один раз и переиспользуются всеми отчетами
+                for task in self._iter_tasks_file():
+                    tasks.append(task)
+                    created.append(_parse_created_at(task.get('created_at')))
+                    codes.append(status_codes.setdefault(task.get('status', 'неизвестно'), len(status_codes)))
+            except (json.JSONDecodeError, FileNotFoundError, *_STREAM_ERRORS) as e:
+                print(f"Ошибка загрузки задач: {e}")
+                tasks, created, codes = [], [], []
+        
+        self._status_names = list(status_codes)
+        # Микросекунды покрывают весь диапазон datetime (годы 1-9999), в отличие от наносекунд
+        created_ts = np.array(created, dtype='datetime64[us]')
+        created_day = created_ts.astype('datetime64[D]')
+        
+        # Колоночное представление полей, по которым строятся отчеты
+        self._cols = {
+            'created_ts': created_ts,
+            'created_day': created_day.astype(np.int64),
+            # 1970-01-01 (день 0) был четвергом
+            'weekday': ((created_day.astype(np.int64) + 3) % 7).astype(np.int8),
+            'hour': ((created_ts - created_day) // np.timedelta64(1, 'h')).astype(np.int8),
+            'status_code': np.array(codes, dtype=np.int16)
+        }
+        return tasks
+    
+    def _stat_tasks_file(self):
+        """Время изменения и размер файла с задачами (None, если файла нет)"""
         try:
+            st = os.stat(self.tasks_file)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def reload_if_changed(self):
+        """
+        Перезагрузка задач, если файл изменился с момента последней загрузки
+        
+        Returns:
+            True, если задачи были перезагружены
+        """
+        if self._stat_tasks_file() == self._file_stat:
+            return False
+        self.tasks = self._load_tasks()
+        return True
+    
+    def _iter_tasks_file(self):
+        """Чтение задач из JSON-файла (большие файлы читаются потоково)"""
+        if ijson is not None and self._file_stat[1] > STREAM_THRESHOLD:
+            with open(self.tasks_file, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        else:
             with open(self.tasks_file, 'r', encoding='utf-8') as f:
-                tasks = json.load(f)
-            return tasks
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"Ошибка загрузки задач: {e}")
-            return []
+                yield from _loads(f.read())
     
     def _filter_tasks_by_date(self, tasks, period_days=None, start_date=None, end_date=None):
         """
@@ -47,29 +192,50 @@ class TaskReporting:
         Returns:
             Отфильтрованный список задач
         """
-        filtered_tasks = []
+        if tasks is self.tasks:
+            created_ts = self._cols['created_ts']
+        else:
+            created_ts = np.array(
+                [_parse_created_at(task.get('created_at')) for task in tasks],
+                dtype='datetime64[us]'
+            )
+        
+        mask = self._date_mask(created_ts, period_days, start_date, end_date)
+        if mask is None:
+            return []
+        
+        return [tasks[i] for i in np.flatnonzero(mask)]
+    
+    @staticmethod
+    def _date_mask(created_ts, period_days=None, start_date=None, end_date=None):
+        """
+        Построение булевой маски задач по дате создания
         
-        for task in tasks:
-            task_date = datetime.fromisoformat(task.get('created_at', '2000-01-01'))
-            now = datetime.now()
-            
-            if period_days:
-                # Фильтр по периоду (последние N дней)
-                cutoff_date = now - timedelta(days=period_days)
-                if task_date >= cutoff_date:
-                    filtered_tasks.append(task)
-            
-            elif start_date and end_date:
-                # Фильтр по диапазону дат
-                try:
-                    start = datetime.fromisoformat(start_date)
-                    end = datetime.fromisoformat(end_date)
-                    if start <= task_date <= end:
-                        filtered_tasks.append(task)
-                except ValueError:
-                    print("Ошибка формата даты. Используйте YYYY-MM-DD")
-        
-        return filtered_tasks
+        Args:
+            created_ts: Массив дат создания задач (datetime64[us])
+            period_days: Количество дней от текущей даты
+            start_date: Начальная дата (строка в формате YYYY-MM-DD)
+            end_date: Конечная дата (строка в формате YYYY-MM-DD)
+        
+        Returns:
+            Булев массив или None, если период не задан или задан неверно
+        """
+        if period_days:
+            # Фильтр по периоду (последние N дней)
+            cutoff_date = np.datetime64(datetime.now() - timedelta(days=period_days), 'us')
+            return created_ts >= cutoff_date
+        
+        if start_date and end_date:
+            # Фильтр по диапазону дат
+            try:
+                start = np.datetime64(datetime.fromisoformat(start_date), 'us')
+                end = np.datetime64(datetime.fromisoformat(end_date), 'us')
+            except ValueError:
+                print("Ошибка формата даты. Используйте YYYY-MM-DD")
+                return None
+            return (created_ts >= start) & (created_ts <= end)
+        
+        return None
     
     def generate_summary_report(self, period="all"):
         """
@@ -91,43 +257,40 @@ class TaskReporting:
         }
         
         if period in period_map:
-            filtered_tasks = self._filter_tasks_by_date(self.tasks, period_days=period_map[period])
+            mask = self._date_mask(self._cols['created_ts'], period_days=period_map[period])
         else:
-            filtered_tasks = self.tasks
+            mask = np.ones(len(self.tasks), dtype=bool)
         
         # Статистика
-        total_tasks = len(filtered_tasks)
-        status_count = defaultdict(int)
+        status_codes = self._cols['status_code'][mask]
+        total_tasks = int(status_codes.size)
+        codes, counts = np.unique(status_codes, return_counts=True)
+        status_count = {self._status_names[code]: int(count) for code, count in zip(codes, counts)}
         completion_rate = 0
         
-        for task in filtered_tasks:
-            status = task.get('status', 'неизвестно')
-            status_count[status] += 1
-        
         # Расчет процента завершенных задач
-        completed = status_count.get('завершенная', 0)
+        completed = int(counts[codes == STATUS_CODES['завершенная']].sum())
         if total_tasks > 0:
             completion_rate = (completed / total_tasks) * 100
         
         # Наиболее активный день
-        tasks_by_day = defaultdict(int)
-        for task in filtered_tasks:
-            task_date = datetime.fromisoformat(task.get('created_at', '2000-01-01'))
-            day_str = task_date.strftime('%Y-%m-%d')
-            tasks_by_day[day_str] += 1
+        tasks_by_day = pd.Series(self._cols['created_day'][mask]).value_counts()
         
-        most_active_day = max(tasks_by_day.items(), key=lambda x: x[1]) if tasks_by_day else ("Нет данных", 0)
+        if len(tasks_by_day):
+            most_active_day = (str(np.datetime64(int(tasks_by_day.index[0]), 'D')), int(tasks_by_day.iloc[0]))
+        else:
+            most_active_day = ("Нет данных", 0)
         
         return {
             "period": period,
             "total_tasks": total_tasks,
-            "status_distribution": dict(status_count),
+            "status_distribution": status_count,
             "completion_rate": round(completion_rate, 2),
             "most_active_day": {
                 "date": most_active_day[0],
                 "tasks_created": most_active_day[1]
             },
-            "average_tasks_per_day": round(total_tasks / len(tasks_by_day), 2) if tasks_by_day else 0
+            "average_tasks_per_day": round(total_tasks / len(tasks_by_day), 2) if len(tasks_by_day) else 0
         }
     
     def generate_status_report(self):
@@ -135,18 +298,21 @@ class TaskReporting:
         if not self.tasks:
             return {"error": "Нет данных для отчета"}
         
-        status_groups = defaultdict(list)
+        status_count = Counter()
+        first_tasks = defaultdict(list)  # Первые 5 задач каждого статуса
         
         for task in self.tasks:
             status = task.get('status', 'неизвестно')
-            status_groups[status].append(task)
+            status_count[status] += 1
+            if len(first_tasks[status]) < 5:
+                first_tasks[status].append({"id": task.get('id'), "title": task.get('title')})
         
         report = {}
-        for status, tasks in status_groups.items():
+        for status, count in status_count.items():
             report[status] = {
-                "count": len(tasks),
-                "percentage": round((len(tasks) / len(self.tasks)) * 100, 2),
-                "tasks": [{"id": t.get('id'), "title": t.get('title')} for t in tasks[:5]]  # Первые 5 задач
+                "count": count,
+                "percentage": round((count / len(self.tasks)) * 100, 2),
+                "tasks": first_tasks[status]
             }
         
         return report
@@ -163,29 +329,28 @@ class TaskReporting:
         
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
+        start_day = np.datetime64(start_date.date(), 'D').astype(np.int64)
+        ndays = max(days + 1, 0)
+        
+        # Матрица "день x статус" считается одним проходом по массивам
+        counts = _bucket_by_day(
+            self._cols['created_day'], self._cols['status_code'],
+            start_day, ndays, len(self._status_names)
+        )
         
         timeline_data = []
         
-        for i in range(days + 1):
+        for i in range(ndays):
             current_date = start_date + timedelta(days=i)
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            # Подсчет задач по дням
-            daily_tasks = [
-                task for task in self.tasks
-                if datetime.fromisoformat(task.get('created_at', '2000-01-01')).date() == current_date.date()
-            ]
-            
-            # Статусы по дням
-            status_count = defaultdict(int)
-            for task in daily_tasks:
-                status = task.get('status', 'неизвестно')
-                status_count[status] += 1
+            day_counts = counts[i]
             
             timeline_data.append({
-                "date": date_str,
-                "total_tasks": len(daily_tasks),
-                "statuses": dict(status_count)
+                "date": current_date.strftime('%Y-%m-%d'),
+                "total_tasks": int(day_counts.sum()),
+                "statuses": {
+                    self._status_names[code]: int(day_counts[code])
+                    for code in np.flatnonzero(day_counts)
+                }
             })
         
         return {
@@ -209,32 +374,22 @@ class TaskReporting:
             6: "Воскресенье"
         }
         
-        weekday_stats = defaultdict(int)
-        hour_stats = defaultdict(int)
-        
-        for task in self.tasks:
-            task_date = datetime.fromisoformat(task.get('created_at', '2000-01-01'))
-            
-            # По дням недели
-            weekday = weekday_map[task_date.weekday()]
-            weekday_stats[weekday] += 1
-            
-            # По часам
-            hour = task_date.hour
-            hour_stats[hour] += 1
+        # Подсчет по дням недели и по часам
+        weekday_counts = np.bincount(self._cols['weekday'], minlength=7)
+        hour_counts = np.bincount(self._cols['hour'], minlength=24)
         
         # Наиболее продуктивные периоды
-        most_productive_day = max(weekday_stats.items(), key=lambda x: x[1]) if weekday_stats else ("Нет данных", 0)
-        most_productive_hour = max(hour_stats.items(), key=lambda x: x[1]) if hour_stats else (-1, 0)
+        most_productive_day = int(weekday_counts.argmax())
+        most_productive_hour = int(hour_counts.argmax())
         
         return {
-            "by_weekday": dict(weekday_stats),
-            "by_hour": dict(hour_stats),
+            "by_weekday": {weekday_map[i]: int(weekday_counts[i]) for i in range(7) if weekday_counts[i]},
+            "by_hour": {i: int(hour_counts[i]) for i in range(24) if hour_counts[i]},
             "most_productive": {
-                "day": most_productive_day[0],
-                "day_count": most_productive_day[1],
-                "hour": f"{most_productive_hour[0]}:00-{most_productive_hour[0] + 1}:00",
-                "hour_count": most_productive_hour[1]
+                "day": weekday_map[most_productive_day],
+                "day_count": int(weekday_counts[most_productive_day]),
+                "hour": f"{most_productive_hour}:00-{most_productive_hour + 1}:00",
+                "hour_count": int(hour_counts[most_productive_hour])
             }
         }
     
@@ -249,7 +404,7 @@ class TaskReporting:
         try:
             # Проверяем тип отчета
             if "period" in report_data:  # Сводный отчет
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                with open(filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
                     writer = csv.writer(f)
                     writer.writerow(['Период', 'Всего задач', 'Процент завершения', 'Самый активный день'])
                     writer.writerow([
@@ -262,9 +417,11 @@ class TaskReporting:
                     # Распределение по статусам
                     writer.writerow([])
                     writer.writerow(['Статус', 'Количество', 'Процент'])
-                    for status, count in report_data.get('status_distribution', {}).items():
-                        percentage = (count / report_data['total_tasks']) * 100 if report_data['total_tasks'] > 0 else 0
-                        writer.writerow([status, count, f"{percentage:.2f}%"])
+                    total = report_data['total_tasks'] or 1
+                    writer.writerows(
+                        (status, count, f"{(count / total) * 100:.2f}%")
+                        for status, count in report_data.get('status_distribution', {}).items()
+                    )
             
             elif "error" in report_data:
                 print(f"Ошибка: {report_data['error']}")
@@ -287,23 +444,52 @@ class TaskReporting:
         """
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2, default=str)
+                f.write(_dumps(report_data))
             print(f"Отчет успешно экспортирован в {filename}")
             return True
         except Exception as e:
             print(f"Ошибка при экспорте в JSON: {e}")
             return False
     
-    def generate_chart(self, report_type="status"):
+    def _get_axes(self, figsize):
+        """
+        Получение осей для графика (фигура создается один раз и переиспользуется)
+        
+        Args:
+            figsize: Размер фигуры в дюймах
+        """
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig, self._ax = plt.subplots(figsize=figsize)
+        else:
+            self._ax.clear()
+            self._fig.set_size_inches(*figsize)
+        return self._ax
+    
+    def _render_chart(self, filename):
+        """
+        Сохранение текущего графика в файл и показ в интерактивном режиме
+        
+        Args:
+            filename: Имя файла для сохранения
+        """
+        self._fig.tight_layout()
+        self._fig.savefig(filename, dpi=CHART_DPI)
+        # Без дисплея (backend Agg) окно не показывается
+        if matplotlib.get_backend().lower() != 'agg':
+            plt.show()
+    
+    def generate_chart(self, report_type="status", report=None):
         """
         Генерация графиков
         
         Args:
             report_type: Тип графика ("status", "timeline", "productivity")
+            report: Готовый отчет соответствующего типа (если не передан, строится заново)
         """
         try:
             if report_type == "status":
-                report = self.generate_status_report()
+                if report is None:
+                    report = self.generate_status_report()
                 if "error" in report:
                     print(report["error"])
                     return
@@ -311,18 +497,17 @@ class TaskReporting:
                 statuses = list(report.keys())
                 counts = [report[s]["count"] for s in statuses]
                 
-                plt.figure(figsize=(10, 6))
-                plt.bar(statuses, counts, color=['green', 'blue', 'orange', 'red'])
-                plt.title('Распределение задач по статусам')
-                plt.xlabel('Статус')
-                plt.ylabel('Количество задач')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                plt.savefig('status_chart.png')
-                plt.show()
+                ax = self._get_axes(figsize=(10, 6))
+                ax.bar(statuses, counts, color=['green', 'blue', 'orange', 'red'])
+                ax.set_title('Распределение задач по статусам')
+                ax.set_xlabel('Статус')
+                ax.set_ylabel('Количество задач')
+                ax.tick_params(axis='x', labelrotation=45)
+                self._render_chart('status_chart.png')
                 
             elif report_type == "timeline":
-                report = self.generate_timeline_report(days=7)
+                if report is None:
+                    report = self.generate_timeline_report(days=7)
                 if "error" in report:
                     print(report["error"])
                     return
@@ -330,16 +515,14 @@ class TaskReporting:
                 dates = [day["date"] for day in report["timeline"]]
                 counts = [day["total_tasks"] for day in report["timeline"]]
                 
-                plt.figure(figsize=(12, 6))
-                plt.plot(dates, counts, marker='o', linewidth=2)
-                plt.title('Активность по дням (последние 7 дней)')
-                plt.xlabel('Дата')
-                plt.ylabel('Количество созданных задач')
-                plt.xticks(rotation=45)
-                plt.grid(True, alpha=0.3)
-                plt.tight_layout()
-                plt.savefig('timeline_chart.png')
-                plt.show()
+                ax = self._get_axes(figsize=(12, 6))
+                ax.plot(dates, counts, marker='o', linewidth=2)
+                ax.set_title(f'Активность по дням (последние {report["period_days"]} дней)')
+                ax.set_xlabel('Дата')
+                ax.set_ylabel('Количество созданных задач')
+                ax.tick_params(axis='x', labelrotation=45)
+                ax.grid(True, alpha=0.3)
+                self._render_chart('timeline_chart.png')
             
             print(f"График сохранен как {report_type}_chart.png")
             
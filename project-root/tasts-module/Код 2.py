@@ -1,19 +1,79 @@
 import json
 import os
+from collections import Counter
 from datetime import datetime
 
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
 # Файл для хранения задач
 TASKS_FILE = "tasks.json"
 
+# Целочисленные коды статусов задач
+STATUS_CODES = {
+    "активная": 0,
+    "в процессе": 1,
+    "завершенная": 2,
+    "неизвестно": 3
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Таблицы интернирования: известные статусы и статусы, встреченные в задачах
+_status_codes = dict(STATUS_CODES)
+_status_names = dict(STATUS_NAMES)
+
+
+def _status_to_code(status):
+    """Получение кода статуса (новые статусы регистрируются автоматически)"""
+    code = _status_codes.get(status)
+    if code is None:
+        code = _status_codes[status] = len(_status_codes)
+        _status_names[code] = status
+    return code
+
+
+def _file_stat(path):
+    """Время изменения и размер файла (None, если файла нет)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 class Task:
     """Класс, представляющий задачу"""
+    __slots__ = ("id", "title", "description", "status_code", "created_at", "updated_at")
+
     def __init__(self, id, title, description, status="активная", created_at=None, updated_at=None):
         self.id = id
         self.title = title
         self.description = description
         self.status = status  # активная, в процессе, завершенная
-        self.created_at = created_at or datetime.now().isoformat()
-        self.updated_at = updated_at or datetime.now().isoformat()
+        now = None if created_at and updated_at else datetime.now().isoformat()
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+
+    @property
+    def status(self):
+        """Название статуса задачи"""
+        return _status_names[self.status_code]
+
+    @status.setter
+    def status(self, value):
+        self.status_code = _status_to_code(value)
 
     def to_dict(self):
         """Преобразование задачи в словарь"""
@@ -39,27 +99,66 @@ class Task:
         )
 
 class TaskManager:
-    """Менеджер задач"""
+    """
+    Менеджер задач
+
+    Изменения не записываются в файл сразу: вызовите flush() после серии
+    изменений или используйте менеджер как контекстный (with TaskManager() as manager).
+    """
     def __init__(self):
-        self.tasks = []
+        self._by_id = {}  # Задачи по ID в порядке добавления
+        self._next_id = 1
+        self._dirty = False
+        self._file_stat = None
         self.load_tasks()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
     def load_tasks(self):
         """Загрузка задач из файла"""
-        if os.path.exists(TASKS_FILE):
+        self._file_stat = _file_stat(TASKS_FILE)
+        if self._file_stat is not None:
             with open(TASKS_FILE, "r", encoding="utf-8") as f:
                 try:
-                    tasks_data = json.load(f)
-                    self.tasks = [Task.from_dict(task) for task in tasks_data]
+                    tasks_data = _loads(f.read())
+                    tasks = [Task.from_dict(task) for task in tasks_data]
                 except json.JSONDecodeError:
-                    self.tasks = []
+                    tasks = []
         else:
-            self.tasks = []
+            tasks = []
+
+        # Следующий свободный ID вычисляется один раз при загрузке
+        self._by_id = {task.id: task for task in tasks}
+        self._next_id = max(self._by_id, default=0) + 1
+        self._dirty = False
 
     def save_tasks(self):
         """Сохранение задач в файл"""
         with open(TASKS_FILE, "w", encoding="utf-8") as f:
-            json.dump([task.to_dict() for task in self.tasks], f, ensure_ascii=False, indent=2)
+            f.write(_dumps([task.to_dict() for task in self._by_id.values()]))
+        self._file_stat = _file_stat(TASKS_FILE)
+        self._dirty = False
+
+    def reload_if_changed(self):
+        """
+        Перезагрузка задач, если файл изменился после последней загрузки или сохранения
+
+        При несохраненных изменениях перезагрузка не выполняется, чтобы их не потерять:
+        сначала вызовите flush() или save_tasks().
+        """
+        if self._dirty or _file_stat(TASKS_FILE) == self._file_stat:
+            return False
+        self.load_tasks()
+        return True
+
+    def flush(self):
+        """Сохранение задач в файл, если были изменения"""
+        if self._dirty:
+            self.save_tasks()
 
     def create_task(self, title, description):
         """Создание новой задачи"""
@@ -67,23 +166,21 @@ class TaskManager:
             return None, "Название задачи не может быть пустым"
 
         # Генерация ID
-        new_id = max([task.id for task in self.tasks], default=0) + 1
+        new_id = self._next_id
+        self._next_id += 1
         task = Task(id=new_id, title=title, description=description)
-        self.tasks.append(task)
-        self.save_tasks()
+        self._by_id[new_id] = task
+        self._dirty = True
         return task, "Задача успешно создана"
 
     def get_task(self, task_id):
         """Получение задачи по ID"""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._by_id.get(task_id)
 
     def update_task(self, task_id, title=None, description=None, status=None):
         """Обновление задачи"""
-        task = self.get_task(task_id)
-        if not task:
+        task = self._by_id.get(task_id)
+        if task is None:
             return False, "Задача не найдена"
 
         if title is not None:
@@ -94,29 +191,31 @@ class TaskManager:
             task.status = status
 
         task.updated_at = datetime.now().isoformat()
-        self.save_tasks()
+        self._dirty = True
         return True, "Задача успешно обновлена"
 
     def delete_task(self, task_id):
         """Удаление задачи"""
-        task = self.get_task(task_id)
+        task = self._by_id.pop(task_id, None)
         if not task:
             return False, "Задача не найдена"
 
-        self.tasks = [t for t in self.tasks if t.id != task_id]
-        self.save_tasks()
+        self._dirty = True
         return True, "Задача успешно удалена"
 
     def get_all_tasks(self):
         """Получение всех задач"""
-        return self.tasks
+        return list(self._by_id.values())
 
     def filter_tasks(self, status=None, keyword=None):
         """Фильтрация задач по статусу и/или ключевому слову"""
-        filtered = self.tasks
+        filtered = self._by_id.values()
 
         if status:
-            filtered = [task for task in filtered if task.status == status]
+            code = _status_codes.get(status)
+            if code is None:
+                return []
+            filtered = [task for task in filtered if task.status_code == code]
 
         if keyword:
             keyword_lower = keyword.lower()
@@ -125,7 +224,7 @@ class TaskManager:
                 if keyword_lower in task.title.lower() or keyword_lower in task.description.lower()
             ]
 
-        return filtered
+        return list(filtered)
 
     def change_status(self, task_id, new_status):
         """Изменение статуса задачи"""
@@ -133,14 +232,11 @@ class TaskManager:
 
     def get_statistics(self):
         """Статистика по задачам"""
-        total = len(self.tasks)
-        active = len([t for t in self.tasks if t.status == "активная"])
-        in_progress = len([t for t in self.tasks if t.status == "в процессе"])
-        completed = len([t for t in self.tasks if t.status == "завершенная"])
+        status_count = Counter(task.status_code for task in self._by_id.values())
 
         return {
-            "total": total,
-            "active": active,
-            "in_progress": in_progress,
-            "completed": completed
+            "total": len(self._by_id),
+            "active": status_count[STATUS_CODES["активная"]],
+            "in_progress": status_count[STATUS_CODES["в процессе"]],
+            "completed": status_count[STATUS_CODES["завершенная"]]
         }
\ No newline at end of file